@@ -10,6 +10,10 @@ from dash.dependencies import ALL
 import json
 import dash_daq as daq
 import logging
+import math
+import threading
+import time
+from functools import lru_cache
 
 logging.basicConfig(level = logging.INFO)
 
@@ -26,7 +30,7 @@ def find_process_by_port(port):
     return None
 
 # Kill any process using the port
-dash_port = 8050
+dash_port = int(os.environ.get('DASH_PORT', 8050))
 process = find_process_by_port(dash_port)
 
 if process and process.pid != os.getpid():
@@ -35,6 +39,10 @@ if process and process.pid != os.getpid():
 
 # SQLAlchemy connection setup
 def create_db_connection():
+    # Fake information_schema backend used by the load test
+    if os.environ.get('PIPELINE_MONITORING_FAKE_BACKEND'):
+        from pipeline_monitoring_fake_backend import FakeConnection
+        return FakeConnection()
     return s2.connect('<ADD CONNECTION STRING HERE>')
 
 # Function to get list of databases
@@ -94,6 +102,440 @@ def get_latency(database_name, pipeline_name):
         return {}
     return df.iloc[0]['latency']
 
+# Batch statistics kept per pipeline so the gauge and graph can show percentiles
+SKETCH_SLOT_SECONDS = 60
+SKETCH_RETENTION_SECONDS = 24 * 60 * 60
+SKETCH_RELATIVE_ACCURACY = 0.01
+BATCH_METRICS = ['Batch Time', 'Rows/sec', 'KBs/sec', 'Batches/sec']
+BATCH_QUANTILES = {'p50': 0.5, 'p95': 0.95, 'p99': 0.99}
+
+# Mergeable log-bucketed histogram (DDSketch style) for streaming percentiles
+class BatchSketch:
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        if value is None or math.isnan(value) or value < 0:
+            return
+        if value == 0:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket keeps the relative error within the accuracy
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+# Sketches of one pipeline's batches, bucketed into fixed time slots
+class PipelineBatchStats:
+    def __init__(self):
+        self.slots = {}  # slot start (epoch seconds) -> {metric: BatchSketch}
+        self.last_batch_id = None
+        self.now_time = None
+
+    def add_batch(self, batch_id, start_time, batch_time, rows_per_sec, mb_per_sec):
+        if self.last_batch_id is not None and batch_id <= self.last_batch_id:
+            return
+        slot_start = int(start_time // SKETCH_SLOT_SECONDS) * SKETCH_SLOT_SECONDS
+        slot = self.slots.get(slot_start)
+        if slot is None:
+            slot = self.slots[slot_start] = {metric: BatchSketch() for metric in BATCH_METRICS}
+        slot['Batch Time'].add(batch_time)
+        slot['Rows/sec'].add(rows_per_sec)
+        if mb_per_sec is not None:
+            slot['KBs/sec'].add(mb_per_sec * 1024)
+        if batch_time:
+            slot['Batches/sec'].add(1 / batch_time)
+        self.last_batch_id = batch_id
+
+    # Moves the window end to the database's current time and drops slots past retention
+    def advance(self, now_time):
+        self.now_time = now_time
+        cutoff = now_time - SKETCH_RETENTION_SECONDS
+        for old_slot in [s for s in self.slots if s + SKETCH_SLOT_SECONDS <= cutoff]:
+            del self.slots[old_slot]
+
+    # Slots inside the window, which ends at the current time so idle pipelines age out
+    def window_slots(self, window_seconds):
+        if self.now_time is None:
+            return []
+        cutoff = self.now_time - window_seconds
+        return sorted(s for s in self.slots if s + SKETCH_SLOT_SECONDS > cutoff)
+
+    def window_sketch(self, metric, window_seconds):
+        merged = BatchSketch()
+        for slot_start in self.window_slots(window_seconds):
+            merged.merge(self.slots[slot_start][metric])
+        return merged
+
+    def window_series(self, metric, window_seconds, q):
+        times, values = [], []
+        for slot_start in self.window_slots(window_seconds):
+            value = self.slots[slot_start][metric].quantile(q)
+            if value is not None:
+                times.append(pd.Timestamp(slot_start, unit='s'))
+                values.append(value)
+        return times, values
+
+batch_stats = {}
+batch_stats_lock = threading.Lock()
+
+# Function to fold new batches of a pipeline into its sketches
+def refresh_batch_stats(database_name, pipeline_name):
+    with batch_stats_lock:
+        stats = batch_stats.setdefault((database_name, pipeline_name), PipelineBatchStats())
+        last_batch_id = stats.last_batch_id
+    if last_batch_id is None:
+        batch_filter = f"start_time > now() - INTERVAL {SKETCH_RETENTION_SECONDS} SECOND"
+    else:
+        batch_filter = f"batch_id > {last_batch_id}"
+    query = f"""
+    SELECT BATCH_ID, START_TIME, BATCH_TIME, ROWS_PER_SEC, MB_PER_SEC
+    FROM information_schema.pipelines_batches_summary
+    WHERE batch_state = 'Succeeded' AND {batch_filter}
+    AND pipeline_name = '{pipeline_name}' AND database_name = '{database_name}'
+    ORDER BY batch_id;
+    """
+    df = pd.read_sql(query, sa_conn)
+    # Database time, converted like START_TIME so both share the same clock
+    now_df = pd.read_sql("SELECT NOW() AS now_time;", sa_conn)
+    now_time = pd.Timestamp(now_df.iloc[0]['now_time']).timestamp()
+    with batch_stats_lock:
+        for row in df.itertuples(index=False):
+            stats.add_batch(
+                row.BATCH_ID,
+                pd.Timestamp(row.START_TIME).timestamp(),
+                row.BATCH_TIME,
+                row.ROWS_PER_SEC,
+                row.MB_PER_SEC
+            )
+        stats.advance(now_time)
+    return stats
+
+# Function to get percentiles of every batch metric over a window
+def get_batch_percentiles(stats, window_seconds):
+    with batch_stats_lock:
+        sketches = {metric: stats.window_sketch(metric, window_seconds) for metric in BATCH_METRICS}
+    return {
+        metric: {name: sketch.quantile(q) for name, q in BATCH_QUANTILES.items()}
+        for metric, sketch in sketches.items()
+    }, sketches['Batch Time'].count
+
+# Snapshots of a pipeline's data, fetched at most once per refresh interval and shared by all sessions
+SNAPSHOT_TTL_SECONDS = 2
+snapshots = {}  # (database, pipeline) -> {'fetched_at', 'version', 'data'}
+snapshot_fetch_locks = {}
+rendered_outputs = {}  # (database, pipeline) -> {'version', 'outputs': {view: callback outputs}}
+snapshot_lock = threading.Lock()
+
+# Function to fetch everything the dashboard shows for a pipeline
+def fetch_pipeline_data(database_name, pipeline_name):
+    files_df = get_files(database_name, pipeline_name)
+    pipeline_config = get_pipeline_config(database_name, pipeline_name)
+    file_state_counts = {'Loaded': 0, 'Skipped': 0, 'Unloaded': 0}
+
+    loaded_query = f"""
+    select file_state, count(*) as count
+    from information_schema.pipelines_files
+    where database_name = '{database_name}' and pipeline_name = '{pipeline_name}'
+    group by file_state;
+    """
+    print(loaded_query)
+    file_state_result = pd.read_sql(loaded_query, sa_conn)
+    for _, row in file_state_result.iterrows():
+        file_state_counts[row['file_state']] = row['count']
+
+    print(file_state_counts)
+
+    stop_on_error = pipeline_config.get('stop_on_error', 'N/A')
+    if not stop_on_error:
+        default_query = "SELECT @@pipelines_stop_on_error;"
+        try:
+            default_df = pd.read_sql(default_query, sa_conn)
+            default_value = default_df.iloc[0, 0]
+            stop_on_error = 'On' if default_value == 1 else 'Off'
+        except Exception as e:
+            print(f"An error occurred while fetching default stop_on_error value: {e}")
+            stop_on_error = 'Unknown'
+    else:
+        stop_on_error = 'On' if stop_on_error == 1 else 'Off'
+
+    latency_query = f"""
+    SELECT database_name, pipeline_name, SUM(cursor_offset - latest_offset) as latency
+    FROM information_schema.pipelines_cursors
+    WHERE database_name = '{database_name}'
+    AND pipeline_name = '{pipeline_name}'
+    GROUP BY 1,2;
+    """
+    latency_df = pd.read_sql(latency_query, sa_conn)
+
+    speed_query = f"""
+    select START_TIME, ROWS_PER_SEC, BATCH_TIME, MB_PER_SEC from information_schema.pipelines_batches_summary where batch_state = 'Succeeded' and start_time > (select now() - 600) and pipeline_name = '{pipeline_name}' and database_name = '{database_name}' order by start_time desc limit 100;
+    """
+    print("executing: ", speed_query)
+    speed_df = pd.read_sql(speed_query, sa_conn)
+
+    stats = refresh_batch_stats(database_name, pipeline_name)
+
+    # NULLs become None rather than NaN so unchanged data compares equal between fetches
+    latency = latency_df.iloc[0]['latency']
+    if pd.isna(latency):
+        latency = None
+    return {
+        'files': list(files_df.itertuples(index=False, name=None)),
+        'file_state_counts': file_state_counts,
+        'pipeline_config': pipeline_config,
+        'stop_on_error': stop_on_error,
+        'latency': latency,
+        'speed': speed_df.astype(object).where(speed_df.notna(), None).to_dict('list'),
+        'last_batch_id': stats.last_batch_id,
+        # Windows only change when their end crosses a slot boundary
+        'now_slot': int(stats.now_time // SKETCH_SLOT_SECONDS)
+    }
+
+# Function to get the current snapshot of a pipeline, bumping its version when the data changed
+def get_pipeline_snapshot(database_name, pipeline_name):
+    key = (database_name, pipeline_name)
+    with snapshot_lock:
+        fetch_lock = snapshot_fetch_locks.setdefault(key, threading.Lock())
+    # Concurrent sessions on the same pipeline wait for one fetch instead of each querying
+    with fetch_lock:
+        snapshot = snapshots.get(key)
+        if snapshot and time.monotonic() - snapshot['fetched_at'] < SNAPSHOT_TTL_SECONDS:
+            return snapshot
+        data = fetch_pipeline_data(database_name, pipeline_name)
+        if snapshot and snapshot['data'] == data:
+            version = snapshot['version']
+        else:
+            version = snapshot['version'] + 1 if snapshot else 0
+        snapshot = {'fetched_at': time.monotonic(), 'version': version, 'data': data}
+        with snapshot_lock:
+            snapshots[key] = snapshot
+        return snapshot
+
+# Prebuilt components shared by every render
+CONFIG_CARD_STYLE = {
+    'border': '2px solid #9A1DD2',
+    'borderRadius': '5px',
+    'padding': '10px',
+    'backgroundColor': '#fff',
+    'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
+    'fontSize': '0.9rem'
+}
+CONFIG_TEXT_STYLE = {'margin': '5px 0', 'color': '#555'}
+FILE_ROW_STYLE = {
+    'display': 'flex',
+    'alignItems': 'center',
+    'padding': '10px',
+    'borderBottom': '1px solid #ddd',
+    'backgroundColor': '#f9f9f9',
+    'marginBottom': '5px',
+    'borderRadius': '5px'
+}
+STATUS_ICONS = {
+    'Loaded': html.Img(src='https://img.icons8.com/?size=100&id=82881&format=png&color=40C057', style={'width': '20px', 'height': '20px'}),
+    'Skipped': html.Img(src='https://img.icons8.com/?size=100&id=23543&format=png&color=FA5252', style={'width': '20px', 'height': '20px'}),
+    'Unloaded': html.Img(src='https://img.icons8.com/?size=100&id=11334&format=png&color=228BE6', style={'width': '20px', 'height': '20px'})
+}
+SOURCE_TYPE_CONTENT = {
+    source_type: html.Div([
+        html.Img(src=icon, style={'width': '40px', 'height': '40px'}),
+        html.P(source_type, style={'marginLeft': '10px', 'fontSize': '1rem', 'color': '#555'})
+    ], style={'display': 'flex', 'alignItems': 'center'})
+    for source_type, icon in [
+        ('S3', 'https://img.icons8.com/?size=100&id=Gk2QpGf92IzK&format=png&color=000000'),
+        ('FS', 'https://img.icons8.com/?size=100&id=2939&format=png&color=000000'),
+        ('KAFKA', 'https://img.icons8.com/?size=100&id=fOhLNqGJsUbJ&format=png&color=000000')
+    ]
+}
+
+# Function to build a pipeline config card
+def config_card(title, content):
+    if not isinstance(content, html.Div):
+        content = html.P(content, style=CONFIG_TEXT_STYLE)
+    return html.Div([
+        html.H4(title, style={'margin': '0', 'color': '#333'}),
+        content
+    ], style=CONFIG_CARD_STYLE)
+
+# Figure templates are built once with Plotly Express; renders only fill in the data arrays
+@lru_cache(maxsize=None)
+def pie_figure_template(labels):
+    fig = px.pie(
+        names=list(labels),
+        values=[0] * len(labels),
+        title='Pipeline Ingestion State',
+        color=list(labels),
+        color_discrete_sequence=['green', 'red', 'blue'],
+        hole=.35
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        margin=dict(l=36, r=36, t=40, b=20),
+        height=None,
+        width=None,
+        autosize=True,
+        template='plotly_white'
+    )
+    return fig.to_dict()
+
+@lru_cache(maxsize=None)
+def line_figure_template(title, y_label, y_max):
+    fig = px.line(
+        pd.DataFrame({'x': [], 'y': []}),
+        x='x',
+        y='y',
+        title=title,
+        labels={'x': 'Time', 'y': y_label}
+    )
+    fig.update_layout(yaxis_range=[0, y_max])
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=40, b=40),
+        height=None,
+        width=None,
+        autosize=True,
+        template='plotly_white'
+    )
+    return fig.to_dict()
+
+EMPTY_LINE_FIGURE = px.line().to_dict()
+
+# Function to copy a figure template with new data for its trace
+def fill_figure(template, **trace_data):
+    figure = dict(template)
+    figure['data'] = [dict(template['data'][0], **trace_data)]
+    return figure
+
+# Function to render the file list
+def render_file_list(files):
+    file_list = []
+    for file_name, file_state in files:
+        show_error_button = html.Span()
+        if file_state == 'Skipped':
+            show_error_button = html.Button('Show Error', id={'type': 'error-button', 'index': file_name}, style={'marginLeft': '10px'})
+        file_list.append(html.Div([
+            html.Span(file_name, style={'flex': '1'}),
+            STATUS_ICONS.get(file_state, html.Span()),
+            show_error_button
+        ], style=FILE_ROW_STYLE))
+    return file_list
+
+# Function to render the pipeline config cards
+def render_pipeline_config(pipeline_config, stop_on_error):
+    source_type = pipeline_config.get('source_type', 'N/A')
+    return [
+        config_card("Source", pipeline_config.get('source', 'N/A')),
+        config_card("Source Type", SOURCE_TYPE_CONTENT.get(source_type, source_type)),
+        config_card("Data Format", pipeline_config.get('data_format', 'N/A')),
+        config_card("Stop on Error", stop_on_error)
+    ]
+
+# Function to render the gauge value, graph and drill-down table
+def render_speed(database_name, pipeline_name, speed, speed_type, speed_statistic, stats_window):
+    with batch_stats_lock:
+        stats = batch_stats[(database_name, pipeline_name)]
+    batch_percentiles, batch_count = get_batch_percentiles(stats, stats_window)
+    batch_drilldown = html.Table([
+        html.Thead(html.Tr(
+            [html.Th(f"{batch_count} batches", style={'textAlign': 'left'})] +
+            [html.Th(name) for name in BATCH_QUANTILES]
+        )),
+        html.Tbody([
+            html.Tr(
+                [html.Td('Batch Time (s)' if metric == 'Batch Time' else metric)] +
+                [html.Td('N/A' if value is None else f"{value:.3f}", style={'textAlign': 'center'})
+                 for value in batch_percentiles[metric].values()]
+            ) for metric in BATCH_METRICS
+        ])
+    ], style={'width': '100%', 'borderCollapse': 'collapse'})
+
+    y_max = {'Rows/sec': 1500, 'KBs/sec': 100, 'Batches/sec': 5}.get(speed_type, 0)
+    if speed_statistic in BATCH_QUANTILES and speed_type in BATCH_METRICS:
+        speed_value = batch_percentiles[speed_type][speed_statistic] or 0
+        with batch_stats_lock:
+            x_values, y_values = stats.window_series(
+                speed_type, stats_window, BATCH_QUANTILES[speed_statistic]
+            )
+        y_label = f'{speed_type} ({speed_statistic})'
+        title = f'Ingestion Performance ({speed_statistic} per minute)'
+    else:
+        x_values = speed['START_TIME']
+        if speed_type == 'Rows/sec':
+            y_values = speed['ROWS_PER_SEC']
+        elif speed_type == 'KBs/sec':
+            y_values = [None if mb_per_sec is None else mb_per_sec * 1024 for mb_per_sec in speed['MB_PER_SEC']]
+        elif speed_type == 'Batches/sec':
+            y_values = [1 / batch_time if batch_time else None for batch_time in speed['BATCH_TIME']]
+        else:
+            x_values = y_values = []
+        speed_value = y_values[0] if y_values and y_values[0] is not None else 0
+        y_label = speed_type
+        title = 'Ingestion Performance'
+    formatted_speed_value = float(f"{speed_value:.3f}")
+    logging.info(f"Updating speedometer to {formatted_speed_value} {speed_type}")
+
+    if not x_values:
+        graph_fig = EMPTY_LINE_FIGURE
+    else:
+        graph_fig = fill_figure(line_figure_template(title, y_label, y_max), x=x_values, y=y_values)
+    logging.info(f"Updating graph to {formatted_speed_value} {speed_type}")
+    return formatted_speed_value, graph_fig, batch_drilldown
+
+# Function to render the callback outputs of a snapshot, memoized per snapshot version and view
+def render_pipeline(database_name, pipeline_name, snapshot, speed_type, speed_statistic, stats_window):
+    key = (database_name, pipeline_name)
+    view = (speed_type, speed_statistic, stats_window)
+    with snapshot_lock:
+        rendered = rendered_outputs.get(key)
+        if rendered is None or rendered['version'] != snapshot['version']:
+            rendered = rendered_outputs[key] = {'version': snapshot['version'], 'outputs': {}}
+        if view in rendered['outputs']:
+            return rendered['outputs'][view]
+
+    data = snapshot['data']
+    file_state_counts = data['file_state_counts']
+    pie_fig = fill_figure(
+        pie_figure_template(tuple(file_state_counts)),
+        values=list(file_state_counts.values())
+    )
+    speed_value, graph_fig, batch_drilldown = render_speed(
+        database_name, pipeline_name, data['speed'], speed_type, speed_statistic, stats_window
+    )
+    outputs = (
+        render_file_list(data['files']),
+        pie_fig,
+        render_pipeline_config(data['pipeline_config'], data['stop_on_error']),
+        data['latency'],
+        speed_value,
+        graph_fig,
+        batch_drilldown
+    )
+    with snapshot_lock:
+        rendered['outputs'][view] = outputs
+    return outputs
+
 # Initialize Dash app
 sa_conn = create_db_connection()
 app = Dash(__name__)
@@ -279,6 +721,47 @@ app.layout = html.Div([
                 'flexDirection': 'row',
                 'gap': '10px',
                 'height': '32vh'
+            }),
+            html.Div([
+                html.Div([
+                    html.H3("Batch Drill-down", style={'color': '#9A1DD2', 'margin': '0', 'flex': '1'}),
+                    dcc.Dropdown(
+                        id='speed-statistic-dropdown',
+                        options=[
+                            {'label': 'Latest batch', 'value': 'Latest'},
+                            {'label': 'p50', 'value': 'p50'},
+                            {'label': 'p95', 'value': 'p95'},
+                            {'label': 'p99', 'value': 'p99'}
+                        ],
+                        value='Latest',
+                        clearable=False,
+                        style={'width': '160px'}
+                    ),
+                    dcc.Dropdown(
+                        id='stats-window-dropdown',
+                        options=[
+                            {'label': 'Last 5 minutes', 'value': 5 * 60},
+                            {'label': 'Last hour', 'value': 60 * 60},
+                            {'label': 'Last 24 hours', 'value': 24 * 60 * 60}
+                        ],
+                        value=60 * 60,
+                        clearable=False,
+                        style={'width': '160px'}
+                    )
+                ], style={
+                    'display': 'flex',
+                    'alignItems': 'center',
+                    'gap': '10px',
+                    'marginBottom': '10px'
+                }),
+                html.Div(id='batch-drilldown')
+            ], style={
+                'border': '2px solid #9A1DD2',
+                'borderRadius': '10px',
+                'backgroundColor': '#fff',
+                'boxShadow': '2px 2px 10px rgba(0,0,0,0.2)',
+                'padding': '10px',
+                'marginTop': '10px'
             })
         ], style={
             'flex': '2',
@@ -302,57 +785,10 @@ app.layout = html.Div([
                 'fontSize': '1rem',
                 'marginBottom': '20px'
             }, children=[
-                # Card for Source
-                html.Div([
-                    html.H4("Source", style={'margin': '0', 'color': '#333'}),
-                    html.P("Source Name Here", style={'margin': '5px 0', 'color': '#555'})
-                ], style={
-                    'border': '2px solid #9A1DD2',
-                    'borderRadius': '5px',
-                    'padding': '10px',
-                    'backgroundColor': '#fff',
-                    'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                    'fontSize': '0.9rem'
-                }),
-
-                # Card for Source Type
-                html.Div([
-                    html.H4("Source Type", style={'margin': '0', 'color': '#333'}),
-                    html.P("Source Type Here", style={'margin': '5px 0', 'color': '#555'})
-                ], style={
-                    'border': '2px solid #9A1DD2',
-                    'borderRadius': '5px',
-                    'padding': '10px',
-                    'backgroundColor': '#fff',
-                    'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                    'fontSize': '0.9rem'
-                }),
-
-                # Card for Data Format
-                html.Div([
-                    html.H4("Data Format", style={'margin': '0', 'color': '#333'}),
-                    html.P("Data Format Here", style={'margin': '5px 0', 'color': '#555'})
-                ], style={
-                    'border': '2px solid #9A1DD2',
-                    'borderRadius': '5px',
-                    'padding': '10px',
-                    'backgroundColor': '#fff',
-                    'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                    'fontSize': '0.9rem'
-                }),
-
-                # Card for Stop on Error
-                html.Div([
-                    html.H4("Stop on Error", style={'margin': '0', 'color': '#333'}),
-                    html.P("Yes/No", style={'margin': '5px 0', 'color': '#555'})
-                ], style={
-                    'border': '2px solid #9A1DD2',
-                    'borderRadius': '5px',
-                    'padding': '10px',
-                    'backgroundColor': '#fff',
-                    'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                    'fontSize': '0.9rem'
-                })
+                config_card("Source", "Source Name Here"),
+                config_card("Source Type", "Source Type Here"),
+                config_card("Data Format", "Data Format Here"),
+                config_card("Stop on Error", "Yes/No")
             ]),
             html.H3("List of files", style={
                 'color': '#9A1DD2',
@@ -411,242 +847,28 @@ def update_pipelines(selected_database):
      Output('pipeline-config-details', 'children'),
      Output('latency-output', 'children'),
      Output('speedometer', 'value'),
-     Output('ingestion-speed-graph', 'figure')],
+     Output('ingestion-speed-graph', 'figure'),
+     Output('batch-drilldown', 'children')],
     [Input('pipeline-dropdown', 'value'),
      Input('interval-component', 'n_intervals')],
     [State('speed-dropdown', 'value'),
+     State('speed-statistic-dropdown', 'value'),
+     State('stats-window-dropdown', 'value'),
      State('selected-database', 'data')]
 )
-def update_files(selected_pipeline, n_intervals, speed_type, selected_database):
+def update_files(selected_pipeline, n_intervals, speed_type, speed_statistic, stats_window, selected_database):
     if selected_database is None or selected_pipeline is None:
-        return [], {}, "", 0, 0, {}
+        return [], {}, "", 0, 0, {}, []
 
     try:
-        files_df = get_files(selected_database, selected_pipeline)
-        pipeline_config = get_pipeline_config(selected_database, selected_pipeline)
-        file_list = []
-        file_state_counts = {'Loaded': 0, 'Skipped': 0, 'Unloaded': 0}
-        
-        loaded_query = f"""
-        select file_state, count(*) as count
-        from information_schema.pipelines_files
-        where database_name = '{selected_database}' and pipeline_name = '{selected_pipeline}'
-        group by file_state;
-        """
-        print(loaded_query)
-        file_state_result = pd.read_sql(loaded_query, sa_conn)
-        for _, row in file_state_result.iterrows():
-            file_state_counts[row['file_state']] = row['count']
-            
-        print(file_state_counts)
-       
-        for _, row in files_df.iterrows():
-            file_name = row['file_name']
-            file_state = row['file_state']
-            show_error_button = html.Span()
-           
-            if file_state == 'Loaded':
-                status_icon = html.Img(src='https://img.icons8.com/?size=100&id=82881&format=png&color=40C057', style={'width': '20px', 'height': '20px'})
-            elif file_state == 'Skipped':
-                status_icon = html.Img(src='https://img.icons8.com/?size=100&id=23543&format=png&color=FA5252', style={'width': '20px', 'height': '20px'})
-                show_error_button = html.Button('Show Error', id={'type': 'error-button', 'index': file_name}, style={'marginLeft': '10px'})
-            elif file_state == 'Unloaded':
-                status_icon = html.Img(src='https://img.icons8.com/?size=100&id=11334&format=png&color=228BE6', style={'width': '20px', 'height': '20px'})
-           
-            file_list.append(html.Div([
-                html.Span(file_name, style={'flex': '1'}),
-                status_icon,
-                show_error_button
-            ], style={
-                'display': 'flex',
-                'alignItems': 'center',
-                'padding': '10px',
-                'borderBottom': '1px solid #ddd',
-                'backgroundColor': '#f9f9f9',
-                'marginBottom': '5px',
-                'borderRadius': '5px'
-            }))
-       
-        # Create the pie chart figure
-        labels = list(file_state_counts.keys())
-        values = list(file_state_counts.values())
-        colors = ['#40C057', '#FA5252', '#228BE6']  # Green, Red, Blue
-
-        fig = px.pie(
-            names=labels,
-            values=values,
-            title='Pipeline Ingestion State',
-            color=labels,
-            color_discrete_sequence=['green', 'red', 'blue'],
-            hole=.35
+        snapshot = get_pipeline_snapshot(selected_database, selected_pipeline)
+        return render_pipeline(
+            selected_database, selected_pipeline, snapshot, speed_type, speed_statistic, stats_window
         )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(
-            margin=dict(l=36, r=36, t=40, b=20),
-            height=None,
-            width=None,
-            autosize=True,
-            template='plotly_white'
-        )
-
 
-        # Pipeline config details
-        source_type_content = pipeline_config.get('source_type', 'N/A')
-        if source_type_content == 'S3':
-            source_type_content = html.Div([
-                html.Img(src='https://img.icons8.com/?size=100&id=Gk2QpGf92IzK&format=png&color=000000', style={'width': '40px', 'height': '40px'}),
-                html.P('S3', style={'marginLeft': '10px', 'fontSize': '1rem', 'color': '#555'})
-            ], style={'display': 'flex', 'alignItems': 'center'})
-        if source_type_content == 'FS':
-            source_type_content = html.Div([
-                html.Img(src='https://img.icons8.com/?size=100&id=2939&format=png&color=000000', style={'width': '40px', 'height': '40px'}),
-                html.P('FS', style={'marginLeft': '10px', 'fontSize': '1rem', 'color': '#555'})
-            ], style={'display': 'flex', 'alignItems': 'center'})
-        if source_type_content == 'KAFKA':
-            source_type_content = html.Div([
-                html.Img(src='https://img.icons8.com/?size=100&id=fOhLNqGJsUbJ&format=png&color=000000', style={'width': '40px', 'height': '40px'}),
-                html.P('KAFKA', style={'marginLeft': '10px', 'fontSize': '1rem', 'color': '#555'})
-            ], style={'display': 'flex', 'alignItems': 'center'})
-        else:
-            source_type_content = html.P(source_type_content, style={'margin': '5px 0', 'color': '#555'})
-
-        stop_on_error = pipeline_config.get('stop_on_error', 'N/A')
-        if not stop_on_error:
-            default_query = "SELECT @@pipelines_stop_on_error;"
-            try:
-                default_df = pd.read_sql(default_query, sa_conn)
-                default_value = default_df.iloc[0, 0]
-                stop_on_error = 'On' if default_value == 1 else 'Off'
-            except Exception as e:
-                print(f"An error occurred while fetching default stop_on_error value: {e}")
-                stop_on_error = 'Unknown'
-        else:
-            stop_on_error = 'On' if stop_on_error == 1 else 'Off'
-       
-        pipeline_config_details = [
-            # Card for Source
-            html.Div([
-                html.H4("Source", style={'margin': '0', 'color': '#333'}),
-                html.P(pipeline_config.get('source', 'N/A'), style={'margin': '5px 0', 'color': '#555'})
-            ], style={
-                'border': '2px solid #9A1DD2',
-                'borderRadius': '5px',
-                'padding': '10px',
-                'backgroundColor': '#fff',
-                'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                'fontSize': '0.9rem'
-            }),
-
-            # Card for Source Type
-            html.Div([
-                html.H4("Source Type", style={'margin': '0', 'color': '#333'}),
-                source_type_content
-            ], style={
-                'border': '2px solid #9A1DD2',
-                'borderRadius': '5px',
-                'padding': '10px',
-                'backgroundColor': '#fff',
-                'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                'fontSize': '0.9rem'
-            }),
-
-            # Card for Data Format
-            html.Div([
-                html.H4("Data Format", style={'margin': '0', 'color': '#333'}),
-                html.P(pipeline_config.get('data_format', 'N/A'), style={'margin': '5px 0', 'color': '#555'})
-            ], style={
-                'border': '2px solid #9A1DD2',
-                'borderRadius': '5px',
-                'padding': '10px',
-                'backgroundColor': '#fff',
-                'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                'fontSize': '0.9rem'
-            }),
-
-            # Card for Stop on Error
-            html.Div([
-                html.H4("Stop on Error", style={'margin': '0', 'color': '#333'}),
-                html.P(stop_on_error, style={'margin': '5px 0', 'color': '#555'})
-            ], style={
-                'border': '2px solid #9A1DD2',
-                'borderRadius': '5px',
-                'padding': '10px',
-                'backgroundColor': '#fff',
-                'boxShadow': '1px 1px 5px rgba(0,0,0,0.1)',
-                'fontSize': '0.9rem'
-            })
-        ]
-        
-        latency_query = f"""
-        SELECT database_name, pipeline_name, SUM(cursor_offset - latest_offset) as latency
-        FROM information_schema.pipelines_cursors
-        WHERE database_name = '{selected_database}' 
-        AND pipeline_name = '{selected_pipeline}'
-        GROUP BY 1,2;
-        """
-        df = pd.read_sql(latency_query, sa_conn)
-
-        
-        speed_query = f"""
-        select START_TIME, ROWS_PER_SEC, BATCH_TIME, MB_PER_SEC from information_schema.pipelines_batches_summary where batch_state = 'Succeeded' and start_time > (select now() - 600) and pipeline_name = '{selected_pipeline}' and database_name = '{selected_database}' order by start_time desc limit 100;
-        """
-        print("executing: ", speed_query)
-        result = pd.read_sql(speed_query, sa_conn)
-        if not result.empty:
-            if speed_type == 'Rows/sec':
-                speed_value = result.iloc[0]['ROWS_PER_SEC']
-                y_values = result['ROWS_PER_SEC']
-                y_label = 'Rows/sec'
-                y_max = 1500
-            elif speed_type == 'KBs/sec':
-                speed_value = result.iloc[0]['MB_PER_SEC'] * 1024
-                y_values = result['MB_PER_SEC'] * 1024
-                y_label = 'KBs/sec'
-                y_max = 100
-            elif speed_type == 'Batches/sec':
-                speed_value = 1 / result.iloc[0]['BATCH_TIME']
-                y_values = 1 / result['BATCH_TIME']
-                y_label = 'Batches/sec'
-                y_max = 5
-            else:
-                speed_value = 0
-                y_values = []
-                y_label = speed_type
-                y_max = 0
-        else:
-            speed_value = 0
-            y_values = []   
-            y_label = speed_type
-            y_max = 0
-        formatted_speed_value = float(f"{speed_value:.3f}")
-        logging.info(f"Updating speedometer to {formatted_speed_value} {speed_type}")
-        
-        if result.empty:
-            graph_fig = px.line()
-        else:        
-            graph_fig = px.line(
-                result,
-                x=result['START_TIME'],
-                y=y_values,
-                title=f'Ingestion Performance',
-                labels={'x': 'Time', 'y': y_label}
-            )
-            graph_fig.update_layout(yaxis_range=[0, y_max])
-            graph_fig.update_layout(
-                margin=dict(l=0, r=0, t=40, b=40),
-                height=None,
-                width=None,
-                autosize=True,
-                template='plotly_white'
-            )
-        logging.info(f"Updating graph to {formatted_speed_value} {speed_type}")
-        
-        
-        return file_list, fig, pipeline_config_details, df.iloc[0]['latency'], formatted_speed_value, graph_fig
-   
     except Exception as e:
         print(f"Error updating files: {e}")
-        return [], {}, "", 0, 0, {}
+        return [], {}, "", 0, 0, {}, []
     
 @app.callback(
     Output('speedometer', 'max'),
@@ -0,0 +1,158 @@
+import datetime
+import json
+import os
+import re
+import threading
+import time
+
+# Fake SingleStore connection serving the information_schema queries the dashboard runs.
+# Enabled in the dashboard with PIPELINE_MONITORING_FAKE_BACKEND=1; used by the load test.
+
+FAKE_DATABASES = int(os.environ.get('PIPELINE_MONITORING_FAKE_DATABASES', 4))
+FAKE_PIPELINES = int(os.environ.get('PIPELINE_MONITORING_FAKE_PIPELINES', 5))
+FAKE_FILES = 200
+FAKE_BATCH_SECONDS = 1.0
+FAKE_HISTORY_SECONDS = 60 * 60
+# Simulated round trip per query, in milliseconds
+FAKE_QUERY_DELAY_MS = float(os.environ.get('PIPELINE_MONITORING_FAKE_QUERY_DELAY_MS', 2))
+# Queries run one at a time, like the single connection shared by the dashboard's threads
+FAKE_PARALLEL_QUERIES = bool(os.environ.get('PIPELINE_MONITORING_FAKE_PARALLEL_QUERIES'))
+SOURCE_TYPES = ['S3', 'FS', 'KAFKA']
+started_at = time.time() - FAKE_HISTORY_SECONDS
+
+def database_names():
+    return [f'loadtest_db{i}' for i in range(FAKE_DATABASES)]
+
+def pipeline_names():
+    return [f'pipeline_{i}' for i in range(FAKE_PIPELINES)]
+
+# Function to get the id of the most recent batch of every fake pipeline
+def latest_batch_id():
+    return int((time.time() - started_at) / FAKE_BATCH_SECONDS)
+
+# Function to build a fake batch; values vary per pipeline and batch but are deterministic
+def fake_batch(pipeline_name, batch_id):
+    seed = (sum(map(ord, pipeline_name)) + batch_id * 7919) % 1000
+    batch_time = 0.2 + seed / 1000
+    rows_per_sec = 200 + seed * 1.2
+    start_time = datetime.datetime.fromtimestamp(started_at + batch_id * FAKE_BATCH_SECONDS, datetime.timezone.utc).replace(tzinfo=None)
+    return batch_id, start_time, batch_time, rows_per_sec, rows_per_sec * 0.05 / 1024
+
+# Function to get the state of a fake file; files load one per batch
+def fake_file_state(file_index):
+    loaded = latest_batch_id() % FAKE_FILES
+    if file_index % 17 == 0:
+        return 'Skipped'
+    return 'Loaded' if file_index < loaded else 'Unloaded'
+
+def quoted(query, column):
+    match = re.search(rf"{column}\s*=\s*'([^']*)'", query, re.IGNORECASE)
+    return match.group(1) if match else None
+
+# Function to answer a query with (columns, rows), the same shape a cursor returns
+def run_query(query):
+    normalized = ' '.join(query.split()).lower()
+    database_name = quoted(query, 'database_name')
+    pipeline_name = quoted(query, 'pipeline_name')
+
+    if normalized.startswith('show databases'):
+        return ['Database'], [(name,) for name in database_names()]
+
+    if normalized.startswith('select now()'):
+        now = datetime.datetime.fromtimestamp(time.time(), datetime.timezone.utc).replace(tzinfo=None)
+        return ['now_time'], [(now,)]
+
+    if '@@pipelines_stop_on_error' in normalized:
+        return ['@@pipelines_stop_on_error'], [(0,)]
+
+    if 'from information_schema.pipelines_files' in normalized:
+        states = [(f'file_{i:05d}.csv', fake_file_state(i)) for i in range(FAKE_FILES)]
+        if 'group by file_state' in normalized:
+            counts = {}
+            for _, state in states:
+                counts[state] = counts.get(state, 0) + 1
+            return ['file_state', 'count'], list(counts.items())
+        states.sort(key=lambda file: file[1], reverse=True)
+        return ['file_name', 'file_state'], states[:50]
+
+    if 'from information_schema.pipelines_cursors' in normalized:
+        latency = (latest_batch_id() * 13) % 5000
+        return ['database_name', 'pipeline_name', 'latency'], [(database_name, pipeline_name, latency)]
+
+    if 'from information_schema.pipelines_batches_summary' in normalized:
+        last_id = latest_batch_id()
+        match = re.search(r'batch_id > (\d+)', normalized)
+        if match:
+            first_id = int(match.group(1)) + 1
+        elif 'interval' in normalized:
+            first_id = 0
+        else:
+            first_id = max(0, last_id - int(600 / FAKE_BATCH_SECONDS))
+        batches = [fake_batch(pipeline_name, batch_id) for batch_id in range(first_id, last_id + 1)]
+        if normalized.startswith('select batch_id'):
+            return ['BATCH_ID', 'START_TIME', 'BATCH_TIME', 'ROWS_PER_SEC', 'MB_PER_SEC'], batches
+        batches.reverse()
+        return ['START_TIME', 'ROWS_PER_SEC', 'BATCH_TIME', 'MB_PER_SEC'], [
+            (start_time, rows_per_sec, batch_time, mb_per_sec)
+            for _, start_time, batch_time, rows_per_sec, mb_per_sec in batches[:100]
+        ]
+
+    if 'from information_schema.pipelines_errors' in normalized:
+        return ['ERROR_MESSAGE'], [('Fake parse error at line 1',)]
+
+    if 'from information_schema.pipelines' in normalized:
+        if pipeline_name is None:
+            return ['pipeline_name'], [(name,) for name in pipeline_names()]
+        if pipeline_name not in pipeline_names():
+            return ['config_json'], []
+        source_type = SOURCE_TYPES[pipeline_names().index(pipeline_name) % len(SOURCE_TYPES)]
+        config = {
+            'connection_string': f'loadtest-bucket/{database_name}/{pipeline_name}',
+            'source_type': source_type,
+            'data_format': 'CSV',
+            'stop_on_error': None
+        }
+        return ['config_json'], [(json.dumps(config),)]
+
+    raise ValueError(f'Fake backend cannot answer query: {query}')
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rows = []
+
+    def execute(self, query, *args):
+        if FAKE_PARALLEL_QUERIES:
+            columns, self.rows = self.connection.run(query)
+        else:
+            with self.connection.lock:
+                columns, self.rows = self.connection.run(query)
+        self.description = [(column, None, None, None, None, None, None) for column in columns]
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def run(self, query):
+        if FAKE_QUERY_DELAY_MS:
+            time.sleep(FAKE_QUERY_DELAY_MS / 1000)
+        return run_query(query)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
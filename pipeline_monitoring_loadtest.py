@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import psutil
+
+# Load test: runs the dashboard against the fake information_schema backend and replays
+# the Dash callback protocol for a growing number of simulated viewers.
+
+REFRESH_SECONDS = 2
+SPEED_TYPES = ['Rows/sec', 'KBs/sec', 'Batches/sec']
+SPEED_STATISTICS = ['Latest', 'p50', 'p95', 'p99']
+STATS_WINDOWS = [5 * 60, 60 * 60, 24 * 60 * 60]
+
+UPDATE_PIPELINES_OUTPUTS = [('pipeline-dropdown', 'options'), ('selected-database', 'data')]
+UPDATE_FILES_OUTPUTS = [
+    ('file-list', 'children'),
+    ('file-states-pie-chart', 'figure'),
+    ('pipeline-config-details', 'children'),
+    ('latency-output', 'children'),
+    ('speedometer', 'value'),
+    ('ingestion-speed-graph', 'figure'),
+    ('batch-drilldown', 'children')
+]
+
+# Function to build the body Dash's renderer posts to /_dash-update-component
+def callback_payload(outputs, inputs, state, changed_prop_id):
+    return {
+        'output': '..' + '...'.join(f'{id}.{prop}' for id, prop in outputs) + '..',
+        'outputs': [{'id': id, 'property': prop} for id, prop in outputs],
+        'inputs': [{'id': id, 'property': prop, 'value': value} for id, prop, value in inputs],
+        'state': [{'id': id, 'property': prop, 'value': value} for id, prop, value in state],
+        'changedPropIds': [changed_prop_id]
+    }
+
+# update_files catches its own exceptions and answers 200 with empty outputs
+def is_fallback_response(body):
+    try:
+        response = json.loads(body).get('response', {})
+    except ValueError:
+        return True
+    return (response.get('file-list', {}).get('children') == []
+            and response.get('ingestion-speed-graph', {}).get('figure') == {})
+
+# Function to post a callback request, returning the latency in seconds and whether it succeeded
+def post_callback(base_url, payload):
+    request = urllib.request.Request(
+        f'{base_url}/_dash-update-component',
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            body = response.read()
+            ok = response.status == 204 or (response.status == 200 and not is_fallback_response(body))
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+# Simulated browser session: picks a database, then a pipeline, then refreshes every interval
+def run_viewer(base_url, databases, pipelines, stop_at, results, results_lock):
+    rng = random.Random()
+    database = rng.choice(databases)
+    pipeline = rng.choice(pipelines)
+    speed_type = rng.choice(SPEED_TYPES)
+    speed_statistic = rng.choice(SPEED_STATISTICS)
+    stats_window = rng.choice(STATS_WINDOWS)
+    # Browsers open the dashboard at different moments, not in lockstep
+    time.sleep(rng.uniform(0, REFRESH_SECONDS))
+
+    samples = [post_callback(base_url, callback_payload(
+        UPDATE_PIPELINES_OUTPUTS,
+        [('database-dropdown', 'value', database)],
+        [],
+        'database-dropdown.value'
+    ))]
+    n_intervals = 0
+    changed_prop_id = 'pipeline-dropdown.value'
+    while time.time() < stop_at:
+        tick_start = time.time()
+        samples.append(post_callback(base_url, callback_payload(
+            UPDATE_FILES_OUTPUTS,
+            [('pipeline-dropdown', 'value', pipeline), ('interval-component', 'n_intervals', n_intervals)],
+            [
+                ('speed-dropdown', 'value', speed_type),
+                ('speed-statistic-dropdown', 'value', speed_statistic),
+                ('stats-window-dropdown', 'value', stats_window),
+                ('selected-database', 'data', database)
+            ],
+            changed_prop_id
+        )))
+        n_intervals += 1
+        changed_prop_id = 'interval-component.n_intervals'
+        # Occasionally switch the view, as a viewer clicking through the dropdowns would
+        if rng.random() < 0.05:
+            speed_type = rng.choice(SPEED_TYPES)
+            speed_statistic = rng.choice(SPEED_STATISTICS)
+        time.sleep(max(0, REFRESH_SECONDS - (time.time() - tick_start)))
+
+    with results_lock:
+        results.extend(samples)
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+# Function to run one step of the load test with a fixed number of viewers
+def run_step(base_url, server, viewers, duration, databases, pipelines):
+    results = []
+    results_lock = threading.Lock()
+    stop_at = time.time() + duration
+    threads = [
+        threading.Thread(target=run_viewer, args=(base_url, databases, pipelines, stop_at, results, results_lock))
+        for _ in range(viewers)
+    ]
+    server.cpu_percent()
+    peak_rss = server.memory_info().rss
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        peak_rss = max(peak_rss, server.memory_info().rss)
+        time.sleep(0.5)
+    elapsed = time.time() - start
+    cpu = server.cpu_percent()
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        'viewers': viewers,
+        'requests': len(results),
+        'throughput': len(results) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0) * 1000,
+        'error_rate': errors / len(results) if results else 0,
+        'server_cpu_percent': cpu,
+        'server_rss_mb': peak_rss / (1024 * 1024)
+    }
+
+def print_row(step):
+    print(
+        f"{step['viewers']:>7} {step['requests']:>8} {step['throughput']:>9.1f} "
+        f"{step['p50_ms']:>8.1f} {step['p95_ms']:>8.1f} {step['p99_ms']:>8.1f} {step['max_ms']:>8.1f} "
+        f"{step['error_rate'] * 100:>6.2f}% {step['server_cpu_percent']:>7.1f}% {step['server_rss_mb']:>8.1f}",
+        flush=True
+    )
+
+# Function to start the dashboard on the fake backend and wait until it serves requests
+def start_dashboard(port, databases, pipelines, query_delay_ms, parallel_queries, log_file):
+    env = dict(
+        os.environ,
+        DASH_PORT=str(port),
+        PIPELINE_MONITORING_FAKE_BACKEND='1',
+        PIPELINE_MONITORING_FAKE_DATABASES=str(databases),
+        PIPELINE_MONITORING_FAKE_PIPELINES=str(pipelines),
+        PIPELINE_MONITORING_FAKE_QUERY_DELAY_MS=str(query_delay_ms)
+    )
+    if parallel_queries:
+        env['PIPELINE_MONITORING_FAKE_PARALLEL_QUERIES'] = '1'
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pipeline_monitoring_dash.py')
+    process = subprocess.Popen(
+        [sys.executable, script],
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Dashboard exited with code {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/', timeout=2):
+                return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError(f'Dashboard did not start on port {port}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent dashboard viewers against a fake backend.')
+    parser.add_argument('--viewers', default='1,5,10,25,50,100',
+                        help='comma separated viewer counts, one step each')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per step')
+    parser.add_argument('--port', type=int, default=8060,
+                        help='dashboard port; any process already using it is killed by the dashboard')
+    parser.add_argument('--databases', type=int, default=4, help='fake databases')
+    parser.add_argument('--pipelines', type=int, default=5, help='fake pipelines per database')
+    parser.add_argument('--query-delay-ms', type=float, default=2, help='simulated round trip per query')
+    parser.add_argument('--parallel-queries', action='store_true',
+                        help='let fake queries overlap instead of serialising them on one shared connection')
+    parser.add_argument('--server-log', help='file for the dashboard output (discarded by default)')
+    parser.add_argument('--json', action='store_true', help='also print the results as JSON')
+    args = parser.parse_args()
+
+    databases = [f'loadtest_db{i}' for i in range(args.databases)]
+    pipelines = [f'pipeline_{i}' for i in range(args.pipelines)]
+    log_file = open(args.server_log, 'w') if args.server_log else subprocess.DEVNULL
+    server = start_dashboard(
+        args.port, args.databases, args.pipelines, args.query_delay_ms, args.parallel_queries, log_file
+    )
+    base_url = f'http://127.0.0.1:{args.port}'
+
+    steps = []
+    try:
+        print(f"{'viewers':>7} {'requests':>8} {'req/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'max ms':>8} {'errors':>7} {'cpu':>8} {'rss MB':>8}")
+        for viewers in [int(count) for count in args.viewers.split(',')]:
+            step = run_step(base_url, psutil.Process(server.pid), viewers, args.duration, databases, pipelines)
+            steps.append(step)
+            print_row(step)
+    finally:
+        server.terminate()
+        server.wait()
+        if args.server_log:
+            log_file.close()
+
+    if args.json:
+        print(json.dumps(steps, indent=2))
+
+if __name__ == '__main__':
+    main()